@@ -2,18 +2,32 @@
 
  
 
-from flask import Flask, jsonify, request 
+from flask import Flask, Response, jsonify, request 
 
-from sqlalchemy import func, and_, or_, text 
+from sqlalchemy import func, and_, or_, text, select, table, column, Float 
 
-from sqlalchemy.orm import joinedload 
+from sqlalchemy.orm import joinedload, contains_eager 
 
-from datetime import datetime, timedelta 
+from datetime import datetime 
 
 from decimal import Decimal 
 
 import logging 
 
+import numpy as np 
+
+import orjson 
+
+ 
+
+try: 
+
+    from numba import njit 
+
+except ImportError:  # numba is optional; fall back to NumPy 
+
+    njit = None 
+
  
 
 app = Flask(__name__) 
@@ -22,6 +36,38 @@ logger = logging.getLogger(__name__)
 
  
 
+# Max product IDs per IN (...) clause when batch-fetching suppliers 
+
+SUPPLIER_LOOKUP_CHUNK_SIZE = 1000 
+
+ 
+
+# Pre-aggregated 30-day sales (schema.sql), refreshed every 10 minutes 
+
+SALES_MV_DAYS = 30 
+
+mv_sales_30d = table( 
+
+    'mv_sales_30d', 
+
+    column('organization_id'), 
+
+    column('product_id'), 
+
+    column('warehouse_id'), 
+
+    column('avg_daily', Float) 
+
+) 
+
+ 
+
+# Urgency labels indexed by compute_alert_fields() urgency index 
+
+URGENCY_LEVELS = ["critical", "high", "medium", "low"] 
+
+ 
+
  
 
 # ============================================ 
@@ -74,6 +120,8 @@ PERFORMANCE ASSUMPTIONS:
 
 4. Query should complete in < 2 seconds 
 
+5. 30-day sales velocity may lag up to 10 minutes (mv_sales_30d refresh) 
+
 """ 
 
  
@@ -88,135 +136,137 @@ PERFORMANCE ASSUMPTIONS:
 
  
 
-def calculate_days_until_stockout(current_stock, avg_daily_sales): 
+def get_preferred_suppliers(product_ids): 
 
     """ 
 
-    Calculate estimated days until stock runs out 
+    Get the preferred supplier for each product, or first available supplier 
 
      
 
     Args: 
 
-        current_stock: Current available inventory 
-
-        avg_daily_sales: Average daily sales over recent period 
+        product_ids: Iterable of product IDs 
 
          
 
     Returns: 
 
-        int: Days until stockout, or None if can't calculate 
+        dict: {product_id: supplier information} 
 
     """ 
 
-    if avg_daily_sales is None or avg_daily_sales <= 0: 
+    product_ids = list(product_ids) 
 
-        return None  # Can't predict if no sales history 
+    supplier_map = {} 
 
-     
+    preferred = set() 
 
-    if current_stock <= 0: 
+     
 
-        return 0  # Already out of stock 
+    # Fetch all active supplier relations in one round-trip per chunk 
 
-     
+    # (chunked to stay under driver bind-parameter limits) 
 
-    days = current_stock / avg_daily_sales 
+    for i in range(0, len(product_ids), SUPPLIER_LOOKUP_CHUNK_SIZE): 
 
-    return int(days) 
+        chunk = product_ids[i:i + SUPPLIER_LOOKUP_CHUNK_SIZE] 
 
- 
+         
 
- 
+        # contains_eager attaches the joined Supplier row to 
 
-def get_preferred_supplier(product_id): 
+        # supplier_relation.supplier, so no lazy load per row 
 
-    """ 
+        rows = db.session.query( 
 
-    Get the preferred supplier for a product, or first available supplier 
+            ProductSupplier 
 
-     
+        ).join( 
 
-    Args: 
+            ProductSupplier.supplier 
 
-        product_id: Product ID 
+        ).options( 
 
-         
+            contains_eager(ProductSupplier.supplier) 
 
-    Returns: 
+        ).filter( 
 
-        dict: Supplier information or None 
+            ProductSupplier.product_id.in_(chunk), 
 
-    """ 
+            Supplier.is_active == True 
 
-    # Try to get preferred supplier first 
+        ).order_by( 
 
-    supplier_relation = ProductSupplier.query.filter_by( 
+            # Stable "first supplier" fallback across requests and cache refills 
 
-        product_id=product_id, 
+            ProductSupplier.product_id, 
 
-        is_preferred=True 
+            ProductSupplier.id 
 
-    ).join(Supplier).filter( 
+        ).all() 
 
-        Supplier.is_active == True 
+         
 
-    ).first() 
+        for supplier_relation in rows: 
 
-     
+            product_id = supplier_relation.product_id 
 
-    # If no preferred supplier, get any active supplier 
+             
 
-    if not supplier_relation: 
+            # Keep preferred supplier if seen, otherwise first supplier 
 
-        supplier_relation = ProductSupplier.query.filter_by( 
+            if product_id in preferred: 
 
-            product_id=product_id 
+                continue 
 
-        ).join(Supplier).filter( 
+            if product_id in supplier_map and not supplier_relation.is_preferred: 
 
-            Supplier.is_active == True 
+                continue 
 
-        ).first() 
+            if supplier_relation.is_preferred: 
 
-     
+                preferred.add(product_id) 
 
-    if not supplier_relation: 
+             
 
-        return None 
+            supplier = supplier_relation.supplier 
 
-     
+            supplier_map[product_id] = { 
 
-    supplier = supplier_relation.supplier 
+                "id": supplier.id, 
 
-    return { 
+                "name": supplier.name, 
 
-        "id": supplier.id, 
+                "contact_email": supplier.contact_email, 
 
-        "name": supplier.name, 
+                "contact_phone": supplier.contact_phone, 
 
-        "contact_email": supplier.contact_email, 
+                "lead_time_days": supplier_relation.lead_time_days, 
 
-        "contact_phone": supplier.contact_phone, 
+                "minimum_order_quantity": supplier_relation.minimum_order_quantity, 
 
-        "lead_time_days": supplier_relation.lead_time_days, 
+                "cost_price": float(supplier_relation.cost_price) if supplier_relation.cost_price else None 
 
-        "minimum_order_quantity": supplier_relation.minimum_order_quantity, 
+            } 
 
-        "cost_price": float(supplier_relation.cost_price) if supplier_relation.cost_price else None 
+     
 
-    } 
+    return supplier_map 
 
  
 
  
 
-def get_recent_sales_data(organization_id, days=30): 
+def build_recent_sales_cte(organization_id): 
 
     """ 
 
-    Get average daily sales per product per warehouse for recent period 
+    Build a CTE with average daily sales per product per warehouse 
+
+     
+
+    Reads the pre-aggregated 30-day window from mv_sales_30d. 
 
      
 
@@ -224,75 +274,27 @@ def get_recent_sales_data(organization_id, days=30):
 
         organization_id: Organization ID 
 
-        days: Number of days to look back (default 30) 
-
          
 
     Returns: 
 
-        dict: {(product_id, warehouse_id): avg_daily_sales} 
+        CTE: columns (product_id, warehouse_id, avg_daily) 
 
     """ 
 
-    cutoff_date = datetime.utcnow() - timedelta(days=days) 
-
-     
-
-    # Query to calculate average daily sales 
-
-    # SUM(quantity) / days for each product-warehouse combination 
-
-    query = db.session.query( 
-
-        SalesOrderItem.product_id, 
-
-        SalesOrderItem.warehouse_id, 
-
-        func.sum(SalesOrderItem.quantity).label('total_quantity') 
-
-    ).join( 
-
-        SalesOrder, 
-
-        SalesOrderItem.order_id == SalesOrder.id 
-
-    ).filter( 
-
-        SalesOrder.organization_id == organization_id, 
+    return select( 
 
-        SalesOrder.order_date >= cutoff_date, 
+        mv_sales_30d.c.product_id, 
 
-        SalesOrder.status.in_(['completed', 'shipped', 'delivered'])  # Only confirmed sales 
+        mv_sales_30d.c.warehouse_id, 
 
-    ).group_by( 
+        mv_sales_30d.c.avg_daily 
 
-        SalesOrderItem.product_id, 
+    ).where( 
 
-        SalesOrderItem.warehouse_id 
+        mv_sales_30d.c.organization_id == organization_id 
 
-    ).all() 
-
-     
-
-    # Calculate average daily sales 
-
-    sales_data = {} 
-
-    for row in query: 
-
-        product_id = row.product_id 
-
-        warehouse_id = row.warehouse_id 
-
-        total_quantity = row.total_quantity 
-
-        avg_daily = total_quantity / days 
-
-        sales_data[(product_id, warehouse_id)] = avg_daily 
-
-     
-
-    return sales_data 
+    ).cte('recent_sales') 
 
  
 
@@ -334,6 +336,10 @@ def get_low_stock_alerts(company_id):
 
     """ 
 
+    now = datetime.utcnow() 
+
+     
+
     try: 
 
         # ============================================ 
@@ -384,6 +390,12 @@ def get_low_stock_alerts(company_id):
 
          
 
+        if limit < 1: 
+
+            return jsonify({"error": "limit must be at least 1"}), 400 
+
+         
+
         if limit > 1000: 
 
             return jsonify({"error": "limit cannot exceed 1000"}), 400 
@@ -392,9 +404,15 @@ def get_low_stock_alerts(company_id):
 
         # Verify organization exists and is active 
 
-        organization = Organization.query.get(company_id) 
+        # Select only is_active (None if the organization doesn't exist) 
+
+        is_active = db.session.query(Organization.is_active).filter( 
+
+            Organization.id == company_id 
+
+        ).scalar() 
 
-        if not organization or not organization.is_active: 
+        if not is_active: 
 
             return jsonify({"error": "Organization not found"}), 404 
 
@@ -406,7 +424,7 @@ def get_low_stock_alerts(company_id):
 
         # ============================================ 
 
-        cache_key = f"low_stock_alerts:{company_id}:{warehouse_id}:{threshold_multiplier}:{include_no_sales}" 
+        cache_key = f"low_stock_alerts:{company_id}:{warehouse_id}:{threshold_multiplier}:{include_no_sales}:{limit}" 
 
          
 
@@ -416,21 +434,21 @@ def get_low_stock_alerts(company_id):
 
         if cached_result: 
 
-            logger.info(f"Cache hit for low stock alerts: {cache_key}") 
+            logger.info("Cache hit for low stock alerts: %s", cache_key) 
 
-            return jsonify(json.loads(cached_result)), 200 
+            # Cached value is the serialized response; pass bytes through as-is 
+
+            return Response(cached_result, mimetype='application/json'), 200 
 
          
 
         # ============================================ 
 
-        # 4. GET RECENT SALES DATA 
+        # 4. BUILD RECENT SALES CTE 
 
         # ============================================ 
 
-        logger.info (f"Calculating recent sales for organization {company_id}") 
-
-        sales_data = get_recent_sales_data(company_id, days=30) 
+        sales_cte = build_recent_sales_cte(company_id) 
 
          
 
@@ -442,13 +460,19 @@ def get_low_stock_alerts(company_id):
 
          
 
-        # Base query: Join inventory with products and warehouses 
+        # Organization's active products with the effective low stock cut-off 
+
+        # computed once per product. CEIL keeps "quantity < threshold * 
+
+        # multiplier" exact for integer quantities and leaves a plain column 
 
-        query = db.session.query( 
+        # comparison for the inventory range scan. 
 
-            Product.id.label('product_id'), 
+        products_cte = select( 
 
-            Product.name.label('product_name'), 
+            Product.id, 
+
+            Product.name, 
 
             Product.sku, 
 
@@ -456,13 +480,43 @@ def get_low_stock_alerts(company_id):
 
             Product.category, 
 
+            func.ceil(Product.low_stock_threshold * threshold_multiplier).label('threshold_cut') 
+
+        ).where( 
+
+            Product.organization_id == company_id, 
+
+            Product.is_deleted == False 
+
+        ).cte('org_products') 
+
+         
+
+        # Base query: Join inventory with products and warehouses, 
+
+        # LEFT JOIN recent sales so products without sales are kept 
+
+        stmt = select( 
+
+            products_cte.c.id.label('product_id'), 
+
+            products_cte.c.name.label('product_name'), 
+
+            products_cte.c.sku, 
+
+            products_cte.c.low_stock_threshold, 
+
+            products_cte.c.category, 
+
             Inventory.warehouse_id, 
 
             Warehouse.name.label('warehouse_name'), 
 
             Inventory.quantity_available.label('current_stock'), 
 
-            Inventory.last_counted_at 
+            Inventory.last_counted_at, 
+
+            func.coalesce(sales_cte.c.avg_daily, 0).label('avg_daily_sales') 
 
         ).select_from( 
 
@@ -470,9 +524,9 @@ def get_low_stock_alerts(company_id):
 
         ).join( 
 
-            Product, 
+            products_cte, 
 
-            Inventory.product_id == Product.id 
+            Inventory.product_id == products_cte.c.id 
 
         ).join( 
 
@@ -480,17 +534,21 @@ def get_low_stock_alerts(company_id):
 
             Inventory.warehouse_id == Warehouse.id 
 
-        ).filter( 
+        ).outerjoin( 
 
-            # Organization filter 
+            sales_cte, 
 
-            Product.organization_id == company_id, 
+            and_( 
 
-             
+                sales_cte.c.product_id == products_cte.c.id, 
 
-            # Only active products and warehouses 
+                sales_cte.c.warehouse_id == Inventory.warehouse_id 
+
+            ) 
 
-            Product.is_deleted == False, 
+        ).where( 
+
+            # Only active warehouses (org and active products via products_cte) 
 
             Warehouse.is_active == True, 
 
@@ -498,7 +556,7 @@ def get_low_stock_alerts(company_id):
 
             # Low stock condition: current_stock < (threshold * multiplier) 
 
-            Inventory.quantity_available < (Product.low_stock_threshold * threshold_multiplier) 
+            Inventory.quantity_available < products_cte.c.threshold_cut 
 
         ) 
 
@@ -508,83 +566,137 @@ def get_low_stock_alerts(company_id):
 
         if warehouse_id: 
 
-            query = query.filter(Inventory.warehouse_id == warehouse_id) 
+            stmt = stmt.where(Inventory.warehouse_id == warehouse_id) 
 
          
 
-        # Execute query 
+        # ============================================ 
 
-        low_stock_items = query.all() 
+        # 6. FILTER BY RECENT SALES ACTIVITY 
+
+        # ============================================ 
+
+        # Skip products with no recent sales (unless explicitly requested) 
+
+        if not include_no_sales: 
+
+            stmt = stmt.where(sales_cte.c.avg_daily > 0) 
 
          
 
-        logger.info(f"Found {len(low_stock_items)} potential low stock items") 
+        # Most urgent first: stockout soonest (no sales last), then lowest 
+
+        # stock; product/warehouse ids make the order deterministic so the 
+
+        # limit always cuts at the same rows 
+
+        stmt = stmt.order_by( 
+
+            (Inventory.quantity_available / func.nullif(sales_cte.c.avg_daily, 0)).asc().nullslast(), 
+
+            Inventory.quantity_available.asc(), 
+
+            products_cte.c.id.asc(), 
+
+            Inventory.warehouse_id.asc() 
+
+        ).limit(limit) 
+
+         
+
+        # Execute query (column-only rows, at most `limit` of them) 
+
+        low_stock_items = db.session.execute(stmt).all() 
+
+         
+
+        logger.info("Found %d low stock items", len(low_stock_items)) 
+
+         
+
+        # Batch-fetch suppliers for all low stock products (avoids N+1 lookups) 
+
+        supplier_map = get_preferred_suppliers({item.product_id for item in low_stock_items}) 
 
          
 
         # ============================================ 
 
-        # 6. FILTER BY RECENT SALES ACTIVITY 
+        # 7. CALCULATE DAYS UNTIL STOCKOUT, URGENCY & REORDER QUANTITY 
 
         # ============================================ 
 
-        alerts = [] 
+        # Vectorized over all rows instead of per-row Python arithmetic 
 
-         
+        count = len(low_stock_items) 
 
-        for item in low_stock_items: 
+        current_stock = np.fromiter((item.current_stock for item in low_stock_items), dtype=np.int64, count=count) 
 
-            product_id = item.product_id 
+        avg_daily_sales = np.fromiter((item.avg_daily_sales for item in low_stock_items), dtype=np.float64, count=count) 
 
-            warehouse_id = item.warehouse_id 
+        thresholds = np.fromiter((item.low_stock_threshold for item in low_stock_items), dtype=np.int64, count=count) 
 
-             
+        # MOQ may be None (no constraint) or a driver Decimal; int64 0 for none 
 
-            # Get sales data for this product-warehouse combination 
+        minimum_order_quantities = np.fromiter( 
 
-            avg_daily_sales = sales_data.get((product_id, warehouse_id), 0) 
+            (int((supplier_map.get(item.product_id) or {}).get('minimum_order_quantity') or 0) for item in low_stock_items), 
 
-             
+            dtype=np.int64, 
 
-            # Skip products with no recent sales (unless explicitly requested) 
+            count=count 
 
-            if not include_no_sales and avg_daily_sales == 0: 
+        ) 
 
-                logger.debug(f"Skipping product {product_id} - no recent sales") 
+         
 
-                continue 
+        days_until_stockout, urgency_idx, reorder_quantity = compute_alert_fields( 
 
-             
+            current_stock, 
 
-            # ============================================ 
+            avg_daily_sales, 
 
-            # 7. CALCULATE DAYS UNTIL STOCKOUT 
+            thresholds, 
 
-            # ============================================ 
+            minimum_order_quantities 
+
+        ) 
 
-            days_until_stockout = calculate_days_until_stockout( 
+         
 
-                item.current_stock, 
+        # Format timestamps in one pass over the (already limited) rows 
 
-                avg_daily_sales 
+        last_counted_at = [ 
 
-            ) 
+            item.last_counted_at.isoformat() if item.last_counted_at else None 
 
-             
+            for item in low_stock_items 
 
-            # ============================================ 
+        ] 
 
-            # 8. GET SUPPLIER INFORMATION 
+         
 
-            # ============================================ 
+        alerts = [] 
 
-            supplier_info = get_preferred_supplier(product_id) 
+        for item, days, urgency, reorder, avg, counted_at in zip( 
 
-             
+            low_stock_items, 
+
+            days_until_stockout.tolist(), 
+
+            urgency_idx.tolist(), 
+
+            reorder_quantity.tolist(), 
+
+            avg_daily_sales.tolist(), 
+
+            last_counted_at 
+
+        ): 
 
             # ============================================ 
 
-            # 9. BUILD ALERT OBJECT 
+            # 8. BUILD ALERT OBJECT 
 
             # ============================================ 
 
@@ -606,29 +718,21 @@ def get_low_stock_alerts(company_id):
 
                 "threshold": item.low_stock_threshold, 
 
-                "days_until_stockout": days_until_stockout, 
+                "days_until_stockout": days if days >= 0 else None, 
 
-                "avg_daily_sales": round(avg_daily_sales, 2) if avg_daily_sales > 0 else None, 
+                "avg_daily_sales": round(avg, 2) if avg > 0 else None, 
 
-                "last_counted_at": item.last_counted_at.isoformat() if item.last_counted_at else None, 
+                "last_counted_at": counted_at, 
 
-                "supplier": supplier_info, 
+                "supplier": supplier_map.get(item.product_id), 
 
                  
 
                 # Additional useful fields 
 
-                "urgency": calculate_urgency(days_until_stockout, item.current_stock), 
-
-                "recommended_reorder_quantity": calculate_reorder_quantity( 
-
-                    item.low_stock_threshold, 
-
-                    item.current_stock, 
+                "urgency": URGENCY_LEVELS[urgency], 
 
-                    supplier_info 
-
-                ) 
+                "recommended_reorder_quantity": reorder 
 
             } 
 
@@ -640,31 +744,7 @@ def get_low_stock_alerts(company_id):
 
         # ============================================ 
 
-        # 10. SORT BY URGENCY 
-
-        # ============================================ 
-
-        # Most urgent first: stockout soonest, then lowest stock 
-
-        alerts.sort(key=lambda x: ( 
-
-            x['days_until_stockout'] if x['days_until_stockout'] is not None else 999, 
-
-            x['current_stock'] 
-
-        )) 
-
-         
-
-        # Apply limit 
-
-        alerts = alerts[:limit] 
-
-         
-
-        # ============================================ 
-
-        # 11. BUILD RESPONSE 
+        # 9. BUILD RESPONSE 
 
         # ============================================ 
 
@@ -672,9 +752,9 @@ def get_low_stock_alerts(company_id):
 
             "alerts": alerts, 
 
-            "total_alerts": len(alerts), 
+            "total_alerts": count, 
 
-            "generated_at": datetime.utcnow().isoformat(), 
+            "generated_at": now.isoformat(), 
 
             "parameters": { 
 
@@ -686,7 +766,7 @@ def get_low_stock_alerts(company_id):
 
                 "include_no_sales": include_no_sales, 
 
-                "sales_period_days": 30 
+                "sales_period_days": SALES_MV_DAYS 
 
             } 
 
@@ -694,35 +774,51 @@ def get_low_stock_alerts(company_id):
 
          
 
+        # Serialize once up front so any failure still reaches the 
+
+        # error handler below as a clean 500 
+
+        payload = orjson.dumps(response) 
+
+         
+
         # ============================================ 
 
-        # 12. CACHE RESULT 
+        # 10. CACHE RESULT 
 
         # ============================================ 
 
-        redis_client.setex( 
+        # A cache outage must not fail an otherwise good response 
 
-            cache_key, 
+        try: 
 
-            300,  # Cache for 5 minutes 
+            redis_client.setex( 
 
-            json.dumps(response) 
+                cache_key, 
 
-        ) 
+                300,  # Cache for 5 minutes 
+
+                payload 
+
+            ) 
+
+        except Exception as e: 
+
+            logger.warning("Failed to cache low stock alerts %s: %s", cache_key, e) 
 
          
 
         # ============================================ 
 
-        # 13. LOG & RETURN 
+        # 11. LOG & RETURN 
 
         # ============================================ 
 
-        logger.info(f"Returning {len(alerts)} low stock alerts for org {company_id}") 
+        logger.info("Returning %d low stock alerts for org %s", count, company_id) 
 
          
 
-        return jsonify(response), 200 
+        return Response(payload, mimetype='application/json'), 200 
 
          
 
@@ -734,7 +830,7 @@ def get_low_stock_alerts(company_id):
 
         # ============================================ 
 
-        logger.error(f"Error generating low stock alerts: {str(e)}", exc_info=True) 
+        logger.error("Error generating low stock alerts: %s", e, exc_info=True) 
 
          
 
@@ -762,106 +858,204 @@ def get_low_stock_alerts(company_id):
 
  
 
-def calculate_urgency(days_until_stockout, current_stock): 
+def generate_request_id(): 
+
+    """Generate unique request ID for debugging""" 
+
+    import uuid 
+
+    return str(uuid.uuid4()) 
+
+ 
+
+ 
+
+def _compute_alert_fields_numpy(current_stock, avg_daily_sales, thresholds, minimum_order_quantities): 
 
     """ 
 
-    Calculate urgency level for the alert 
+    Vectorized days until stockout, urgency and reorder quantity (NumPy fallback) 
+
+     
+
+    Computed over all alert rows at once: 
+
+    - days until stockout = current_stock / avg_daily_sales, truncated 
+
+      (0 if out of stock, -1 if no sales history) 
+
+    - urgency: out of stock or <=3 days critical, <=7 high, <=14 medium, 
+
+      else (or no sales history) low 
+
+    - reorder: bring stock back to 2x threshold, at least the supplier 
+
+      MOQ, rounded up to the nearest 10 (minimum 10) 
+
+     
+
+    Args: 
+
+        current_stock: int64 array of available inventory 
+
+        avg_daily_sales: float64 array of average daily sales (0 if none) 
+
+        thresholds: int64 array of low stock thresholds 
+
+        minimum_order_quantities: int64 array of supplier MOQs (0 if none) 
+
+         
 
     Returns: 
 
-        str: "critical", "high", "medium", "low" 
+        tuple: (days_until_stockout, urgency_idx, reorder_quantity) int64 arrays; 
 
-    """ 
+               days_until_stockout is -1 where it can't be calculated, 
 
-    if current_stock <= 0: 
+               urgency_idx indexes URGENCY_LEVELS 
+
+    """ 
 
-        return "critical" 
+    has_sales = avg_daily_sales > 0 
 
      
 
-    if days_until_stockout is None: 
+    # Days until stockout (0 if already out of stock, -1 if no sales history) 
 
-        return "low"  # No sales data, less urgent 
+    safe_avg = np.where(has_sales, avg_daily_sales, 1.0) 
+
+    days = np.floor(np.maximum(current_stock, 0) / safe_avg).astype(np.int64) 
+
+    days = np.where(has_sales, days, -1) 
 
      
 
-    if days_until_stockout <= 3: 
+    # Urgency: <=3 critical, <=7 high, <=14 medium, else low 
 
-        return "critical" 
+    urgency_idx = np.digitize(days, [3, 7, 14], right=True) 
 
-    elif days_until_stockout <= 7: 
+    urgency_idx = np.where(has_sales, urgency_idx, 3)  # No sales data, less urgent 
 
-        return "high" 
+    urgency_idx = np.where(current_stock <= 0, 0, urgency_idx) 
 
-    elif days_until_stockout <= 14: 
+     
 
-        return "medium" 
+    # Reorder: bring stock back to 2x threshold, at least supplier MOQ, 
 
-    else: 
+    # rounded up to nearest 10 
 
-        return "low" 
+    needed = np.maximum(thresholds * 2 - current_stock, minimum_order_quantities) 
+
+    reorder_quantity = np.maximum(10, ((needed + 9) // 10) * 10) 
+
+     
+
+    return days, urgency_idx.astype(np.int64), reorder_quantity 
 
  
 
  
 
-def calculate_reorder_quantity(threshold, current_stock, supplier_info): 
+def _compute_alert_fields_kernel(current_stock, avg_daily_sales, thresholds, minimum_order_quantities): 
 
     """ 
 
-    Suggest reorder quantity based on threshold and supplier constraints 
-
-    Args: 
+    Single-pass days until stockout, urgency and reorder quantity 
 
-        threshold: Low stock threshold 
-
-        current_stock: Current available stock 
+     
 
-        supplier_info: Supplier information including MOQ 
+    Scalar loop over preallocated arrays, meant to be compiled with 
 
-    Returns: 
+    numba.njit. Same arguments and return values as 
 
-        int: Recommended reorder quantity 
+    _compute_alert_fields_numpy. 
 
     """ 
 
-    # Base calculation: Bring stock back to 2x threshold (safety buffer) 
+    count = current_stock.shape[0] 
 
-    target_stock = threshold * 2 
+    days = np.empty(count, dtype=np.int64) 
 
-    needed = target_stock - current_stock 
+    urgency_idx = np.empty(count, dtype=np.int64) 
+
+    reorder_quantity = np.empty(count, dtype=np.int64) 
 
      
 
-    # Apply supplier minimum order quantity if available 
+    for i in range(count): 
 
-    if supplier_info and supplier_info.get('minimum_order_quantity'): 
+        stock = current_stock[i] 
 
-        moq = supplier_info['minimum_order_quantity'] 
+        avg = avg_daily_sales[i] 
 
-        if needed < moq: 
+         
 
-            needed = moq 
+        # Days until stockout (0 if already out of stock, -1 if no sales history) 
 
-     
+        if avg > 0: 
+
+            day = int(max(stock, 0) / avg) 
+
+        else: 
+
+            day = -1 
+
+        days[i] = day 
+
+         
+
+        # Urgency: <=3 critical, <=7 high, <=14 medium, else low 
+
+        if stock <= 0: 
+
+            urgency_idx[i] = 0 
+
+        elif day < 0: 
+
+            urgency_idx[i] = 3  # No sales data, less urgent 
+
+        elif day <= 3: 
 
-    # Round up to nearest 10 for convenience (optional) 
+            urgency_idx[i] = 0 
 
-    needed = max(10, ((needed + 9) // 10) * 10) 
+        elif day <= 7: 
+
+            urgency_idx[i] = 1 
+
+        elif day <= 14: 
+
+            urgency_idx[i] = 2 
+
+        else: 
+
+            urgency_idx[i] = 3 
+
+         
+
+        # Reorder: bring stock back to 2x threshold, at least supplier MOQ, 
+
+        # rounded up to nearest 10 
+
+        needed = thresholds[i] * 2 - stock 
+
+        if needed < minimum_order_quantities[i]: 
+
+            needed = minimum_order_quantities[i] 
+
+        reorder_quantity[i] = max(10, ((needed + 9) // 10) * 10) 
 
      
 
-    return needed 
+    return days, urgency_idx, reorder_quantity 
 
  
 
  
 
-def generate_request_id(): 
+if njit is not None: 
 
-    """Generate unique request ID for debugging""" 
+    compute_alert_fields = njit(cache=True)(_compute_alert_fields_kernel) 
 
-    import uuid 
+else: 
 
-    return str(uuid.uuid4()) 
+    compute_alert_fields = _compute_alert_fields_numpy 
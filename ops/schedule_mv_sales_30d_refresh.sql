@@ -0,0 +1,24 @@
+-- ============================================
+-- SCHEDULE mv_sales_30d REFRESH (pg_cron)
+-- ============================================
+-- The low stock alerts endpoint reads 30-day sales velocity from
+-- mv_sales_30d (schema.sql), which must be refreshed every 10 minutes.
+--
+-- Run once per environment, after schema.sql, as a superuser connected to
+-- the database named in cron.database_name (default: postgres). Requires
+-- pg_cron in shared_preload_libraries. Pass the application database name:
+--
+--   psql -d postgres -v app_database=<app db> -f ops/schedule_mv_sales_30d_refresh.sql
+--
+-- Without pg_cron, run the same REFRESH statement from any external
+-- scheduler (cron, Kubernetes CronJob, ...) every 10 minutes instead.
+
+CREATE EXTENSION IF NOT EXISTS pg_cron;
+
+-- Re-running replaces the existing job of the same name
+SELECT cron.schedule_in_database(
+    'refresh-mv-sales-30d',
+    '*/10 * * * *',
+    'REFRESH MATERIALIZED VIEW CONCURRENTLY mv_sales_30d',
+    :'app_database'
+);
@@ -716,6 +716,130 @@ CREATE INDEX idx_po_items_product ON purchase_order_items(product_id);
 
  
 
+-- ============================================ 
+
+-- SALES ORDERS (drives low stock alert sales velocity) 
+
+-- ============================================ 
+
+ 
+
+CREATE TABLE sales_orders ( 
+
+    id SERIAL PRIMARY KEY, 
+
+    organization_id INTEGER NOT NULL REFERENCES organizations(id), 
+
+     
+
+    order_number VARCHAR(50) NOT NULL, -- Human-readable order number 
+
+    status VARCHAR(50) NOT NULL DEFAULT 'pending', 
+
+    -- pending, completed, shipped, delivered, cancelled, returned 
+
+     
+
+    order_date TIMESTAMP NOT NULL DEFAULT NOW(), 
+
+     
+
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(), 
+
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(), 
+
+    created_by INTEGER REFERENCES users(id), 
+
+     
+
+    CONSTRAINT unique_so_number_per_org UNIQUE(organization_id, order_number) 
+
+); 
+
+ 
+
+-- mv_sales_30d refresh: date range across all organizations, confirmed sales only 
+
+-- (the WHERE must match the view's status predicate for the planner to use it) 
+
+CREATE INDEX idx_sales_order_date_confirmed ON sales_orders(order_date) 
+
+    WHERE status IN ('completed', 'shipped', 'delivered'); 
+
+ 
+
+CREATE TABLE sales_order_items ( 
+
+    id SERIAL PRIMARY KEY, 
+
+    order_id INTEGER NOT NULL REFERENCES sales_orders(id) ON DELETE CASCADE, 
+
+    product_id INTEGER NOT NULL REFERENCES products(id), 
+
+    warehouse_id INTEGER NOT NULL REFERENCES warehouses(id), -- Fulfilling warehouse 
+
+     
+
+    quantity INTEGER NOT NULL, 
+
+    unit_price DECIMAL(15, 4), 
+
+     
+
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(), 
+
+     
+
+    CONSTRAINT positive_quantity CHECK (quantity > 0) 
+
+); 
+
+ 
+
+-- Join from sales_orders plus GROUP BY (product_id, warehouse_id) 
+
+CREATE INDEX idx_soi_order_prod_wh ON sales_order_items(order_id, product_id, warehouse_id); 
+
+ 
+
+-- Average daily sales over the last 30 days, shared by all organizations 
+
+CREATE MATERIALIZED VIEW mv_sales_30d AS 
+
+SELECT  
+
+    soi.product_id, 
+
+    soi.warehouse_id, 
+
+    so.organization_id, 
+
+    SUM(soi.quantity)::FLOAT8 / 30 as avg_daily 
+
+FROM sales_order_items soi 
+
+JOIN sales_orders so ON soi.order_id = so.id 
+
+WHERE so.order_date >= NOW() - INTERVAL '30 days' 
+
+  AND so.status IN ('completed', 'shipped', 'delivered') 
+
+GROUP BY soi.product_id, soi.warehouse_id, so.organization_id; 
+
+ 
+
+-- Unique index required for REFRESH ... CONCURRENTLY 
+
+CREATE UNIQUE INDEX idx_mv_sales_30d_org_prod_wh ON mv_sales_30d(organization_id, product_id, warehouse_id); 
+
+ 
+
+-- Must be refreshed every 10 minutes; scheduling lives outside the schema, 
+
+-- see ops/schedule_mv_sales_30d_refresh.sql 
+
+ 
+
 -- ============================================ 
 
 -- WAREHOUSE TRANSFERS 
@@ -0,0 +1,313 @@
+import itertools
+import json
+import math
+import random
+import types
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("flask")
+sqlalchemy = pytest.importorskip("sqlalchemy")
+np = pytest.importorskip("numpy")
+pytest.importorskip("orjson")
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, Numeric, String, create_engine, event, text
+from sqlalchemy.orm import declarative_base, relationship, scoped_session, sessionmaker
+
+import lowstocklert
+
+
+# ============================================
+# STAND-IN MODELS (the real ones live outside this module)
+# ============================================
+
+Base = declarative_base()
+
+
+class Organization(Base):
+    __tablename__ = 'organizations'
+    id = Column(Integer, primary_key=True)
+    is_active = Column(Boolean)
+
+
+class Warehouse(Base):
+    __tablename__ = 'warehouses'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    is_active = Column(Boolean)
+
+
+class Product(Base):
+    __tablename__ = 'products'
+    id = Column(Integer, primary_key=True)
+    organization_id = Column(Integer)
+    name = Column(String)
+    sku = Column(String)
+    category = Column(String)
+    low_stock_threshold = Column(Integer)
+    is_deleted = Column(Boolean)
+
+
+class Inventory(Base):
+    __tablename__ = 'inventory'
+    id = Column(Integer, primary_key=True)
+    product_id = Column(ForeignKey('products.id'))
+    warehouse_id = Column(ForeignKey('warehouses.id'))
+    quantity_available = Column(Integer)
+    last_counted_at = Column(DateTime)
+
+
+class Supplier(Base):
+    __tablename__ = 'suppliers'
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    contact_email = Column(String)
+    contact_phone = Column(String)
+    is_active = Column(Boolean)
+
+
+class ProductSupplier(Base):
+    __tablename__ = 'product_suppliers'
+    id = Column(Integer, primary_key=True)
+    product_id = Column(ForeignKey('products.id'))
+    supplier_id = Column(ForeignKey('suppliers.id'))
+    lead_time_days = Column(Integer)
+    minimum_order_quantity = Column(Integer)
+    cost_price = Column(Numeric)
+    is_preferred = Column(Boolean)
+    supplier = relationship(Supplier)
+
+
+class FakeRedis(dict):
+    def get(self, key):
+        return dict.get(self, key)
+
+    def setex(self, key, ttl, value):
+        self[key] = value
+
+
+class FailingRedis(FakeRedis):
+    def setex(self, key, ttl, value):
+        raise ConnectionError("redis down")
+
+
+class User:
+    def has_access_to_organization(self, organization_id):
+        return True
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+
+    @event.listens_for(engine, 'connect')
+    def _register_ceil(connection, record):
+        connection.create_function('ceil', 1, lambda x: None if x is None else math.ceil(x))
+
+    Base.metadata.create_all(engine)
+    factory = scoped_session(sessionmaker(engine))
+    s = factory()
+    now = datetime.utcnow()
+
+    s.add_all([
+        Organization(id=1, is_active=True),
+        Warehouse(id=1, name='A', is_active=True),
+        Warehouse(id=2, name='B', is_active=True),
+        Supplier(id=1, name='s1', is_active=True),
+        Supplier(id=2, name='s2', is_active=True),
+    ])
+    for pid in range(1, 8):
+        s.add(Product(id=pid, organization_id=1, name=f'P{pid}', sku=f'S{pid}',
+                      category='c', low_stock_threshold=20, is_deleted=False))
+        for wid in (1, 2):
+            s.add(Inventory(product_id=pid, warehouse_id=wid, quantity_available=pid * 2 + wid,
+                            last_counted_at=now if pid % 2 else None))
+    s.add_all([
+        ProductSupplier(product_id=1, supplier_id=1, minimum_order_quantity=100, is_preferred=False),
+        ProductSupplier(product_id=1, supplier_id=2, minimum_order_quantity=None, is_preferred=True),
+        ProductSupplier(product_id=2, supplier_id=1, minimum_order_quantity=55, is_preferred=False),
+    ])
+    s.execute(text("CREATE TABLE mv_sales_30d (organization_id INTEGER, product_id INTEGER, "
+                   "warehouse_id INTEGER, avg_daily FLOAT)"))
+    for pid, wid, quantity in [(1, 1, 30), (2, 1, 90), (3, 2, 300), (5, 1, 3)]:
+        s.execute(text("INSERT INTO mv_sales_30d VALUES (1, :p, :w, :a)"),
+                  {'p': pid, 'w': wid, 'a': quantity / 30.0})
+    s.commit()
+
+    yield factory
+    factory.remove()
+
+
+@pytest.fixture
+def client(session, monkeypatch):
+    for name, value in {
+        'db': types.SimpleNamespace(session=session),
+        'redis_client': FakeRedis(),
+        'get_current_user': User,
+        'Organization': Organization,
+        'Warehouse': Warehouse,
+        'Product': Product,
+        'Inventory': Inventory,
+        'Supplier': Supplier,
+        'ProductSupplier': ProductSupplier,
+    }.items():
+        monkeypatch.setattr(lowstocklert, name, value, raising=False)
+    return lowstocklert.app.test_client()
+
+
+def get_alerts(client, query_string=''):
+    response = client.get('/api/companies/1/alerts/low-stock' + query_string)
+    assert response.status_code == 200, response.data
+    body = json.loads(response.data)
+    return [(a['product_id'], a['warehouse_id']) for a in body['alerts']]
+
+
+# ============================================
+# ENDPOINT
+# ============================================
+
+QUERY_STRINGS = [
+    '',
+    '?include_no_sales=true',
+    '?warehouse_id=1',
+    '?warehouse_id=1&include_no_sales=true',
+    '?threshold_multiplier=0.5',
+    '?include_no_sales=true&limit=5',
+]
+
+
+def test_parameter_combinations_in_any_order(client):
+    """Statement caching must not leak state between parameter combinations"""
+    expected = {qs: get_alerts(client, qs) for qs in QUERY_STRINGS}
+
+    for order in itertools.islice(itertools.permutations(QUERY_STRINGS), 0, None, 97):
+        lowstocklert.redis_client.clear()
+        for qs in order:
+            assert get_alerts(client, qs) == expected[qs]
+
+
+def test_include_no_sales_first_then_defaults(client):
+    assert len(get_alerts(client, '?include_no_sales=true')) == 14
+    assert get_alerts(client, '') == [(3, 2), (2, 1), (1, 1), (5, 1)]
+    assert get_alerts(client, '?warehouse_id=1') == [(2, 1), (1, 1), (5, 1)]
+
+
+def test_alert_fields(client):
+    body = json.loads(client.get('/api/companies/1/alerts/low-stock').data)
+    alerts = {(a['product_id'], a['warehouse_id']): a for a in body['alerts']}
+
+    assert body['total_alerts'] == 4
+    assert alerts[(1, 1)]['supplier']['name'] == 's2'  # preferred wins
+    assert alerts[(1, 1)]['supplier']['minimum_order_quantity'] is None
+    assert alerts[(2, 1)]['recommended_reorder_quantity'] == 60  # MOQ 55 rounded up
+    assert alerts[(3, 2)]['days_until_stockout'] == 0
+    assert alerts[(5, 1)]['urgency'] == 'low'
+
+
+def test_first_supplier_fallback_is_lowest_relation_id(client, session):
+    s = session()
+    s.add(ProductSupplier(id=10, product_id=3, supplier_id=2, minimum_order_quantity=7, is_preferred=False))
+    s.add(ProductSupplier(id=5, product_id=3, supplier_id=1, minimum_order_quantity=9, is_preferred=False))
+    s.commit()
+
+    body = json.loads(client.get('/api/companies/1/alerts/low-stock').data)
+    alerts = {(a['product_id'], a['warehouse_id']): a for a in body['alerts']}
+    assert alerts[(3, 2)]['supplier']['name'] == 's1'
+
+
+def test_cache_hit_returns_same_body(client):
+    first = client.get('/api/companies/1/alerts/low-stock').data
+    second = client.get('/api/companies/1/alerts/low-stock')
+    assert second.status_code == 200
+    assert second.data == first
+
+
+def test_cache_write_failure_still_returns_response(client, monkeypatch):
+    monkeypatch.setattr(lowstocklert, 'redis_client', FailingRedis())
+    assert get_alerts(client) == [(3, 2), (2, 1), (1, 1), (5, 1)]
+
+
+def test_serialization_failure_returns_error(client, monkeypatch):
+    def failing_dumps(obj):
+        raise TypeError("not serializable")
+
+    monkeypatch.setattr(lowstocklert.orjson, 'dumps', failing_dumps)
+    response = client.get('/api/companies/1/alerts/low-stock')
+    assert response.status_code == 500
+    assert 'request_id' in json.loads(response.data)
+
+
+@pytest.mark.parametrize('limit', ['-1', '0', '1001'])
+def test_limit_out_of_range(client, limit):
+    response = client.get('/api/companies/1/alerts/low-stock?limit=' + limit)
+    assert response.status_code == 400
+
+
+def test_unknown_organization(client):
+    assert client.get('/api/companies/99/alerts/low-stock').status_code == 404
+
+
+# ============================================
+# ALERT FIELD COMPUTATION
+# ============================================
+
+def reference_alert_fields(current_stock, avg_daily_sales, threshold, minimum_order_quantity):
+    """Original per-row rules the vectorized implementations must match"""
+    if avg_daily_sales <= 0:
+        days = None  # Can't predict if no sales history
+    elif current_stock <= 0:
+        days = 0  # Already out of stock
+    else:
+        days = int(current_stock / avg_daily_sales)
+
+    if current_stock <= 0:
+        urgency = "critical"
+    elif days is None:
+        urgency = "low"
+    elif days <= 3:
+        urgency = "critical"
+    elif days <= 7:
+        urgency = "high"
+    elif days <= 14:
+        urgency = "medium"
+    else:
+        urgency = "low"
+
+    needed = threshold * 2 - current_stock
+    if minimum_order_quantity and needed < minimum_order_quantity:
+        needed = minimum_order_quantity
+    reorder = max(10, ((needed + 9) // 10) * 10)
+
+    return days, urgency, reorder
+
+
+def random_alert_rows(count=20000, seed=1):
+    rng = random.Random(seed)
+    current_stock = [rng.randint(-5, 300) for _ in range(count)]
+    avg_daily_sales = [rng.choice([0, 0, rng.random() * 20, rng.randint(1, 5) / 3]) for _ in range(count)]
+    thresholds = [rng.randint(0, 200) for _ in range(count)]
+    minimum_order_quantities = [rng.choice([0, 0, rng.randint(1, 500)]) for _ in range(count)]
+    return current_stock, avg_daily_sales, thresholds, minimum_order_quantities
+
+
+@pytest.mark.parametrize('implementation', [
+    lowstocklert._compute_alert_fields_numpy,
+    lowstocklert.compute_alert_fields,
+    pytest.param(lowstocklert._compute_alert_fields_kernel, id='kernel-interpreted'),
+])
+def test_compute_alert_fields_matches_reference(implementation):
+    rows = random_alert_rows()
+    days, urgency_idx, reorder = implementation(
+        np.array(rows[0], dtype=np.int64),
+        np.array(rows[1], dtype=np.float64),
+        np.array(rows[2], dtype=np.int64),
+        np.array(rows[3], dtype=np.int64)
+    )
+
+    got = [
+        (d if d >= 0 else None, lowstocklert.URGENCY_LEVELS[u], r)
+        for d, u, r in zip(days.tolist(), urgency_idx.tolist(), reorder.tolist())
+    ]
+    expected = [reference_alert_fields(*row) for row in zip(*rows)]
+    assert got == expected